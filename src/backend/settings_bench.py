@@ -0,0 +1,26 @@
+import os
+from .settings_test import *
+
+# Con DEBUG=True Django guarda cada query en connection.queries_log, incluidos los
+# INSERT de bulk_create con todo el JSON generado. CaptureQueriesContext fuerza el
+# cursor de debug por su cuenta, así que el conteo de queries sigue funcionando.
+DEBUG = False
+
+# Settings para tests/bench_exports.py.
+# Por defecto SQLite en memoria; con BENCH_DATABASE_NAME usa un Postgres local dedicado.
+# Nunca lee DATABASE_* para no apuntar por accidente a la base desplegada.
+if os.environ.get("BENCH_DATABASE_NAME"):
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ["BENCH_DATABASE_NAME"],
+            "USER": os.environ.get("BENCH_DATABASE_USER", "postgres"),
+            "PASSWORD": os.environ.get("BENCH_DATABASE_PASSWORD", ""),
+            "HOST": os.environ.get("BENCH_DATABASE_HOST", "localhost"),
+            "PORT": os.environ.get("BENCH_DATABASE_PORT", "5432"),
+            "OPTIONS": {
+                # Un Postgres local normalmente no tiene SSL
+                "sslmode": os.environ.get("PGSSLMODE", "disable"),
+            },
+        }
+    }
@@ -0,0 +1,402 @@
+"""
+Benchmark de las funciones de exportación de formularios.
+
+Genera formularios sintéticos (muchas páginas, campos string/number/boolean/dataset
+y varias versiones de índice) con miles de FormularioEntry, y mide para cada
+función y formato: tiempo de pared, memoria pico (tracemalloc) y número de queries.
+El resultado se escribe en JSON para comparar entre releases.
+
+Uso (desde la raíz del backend):
+    python tests/bench_exports.py --entries 10000 100000 --output bench.json
+    python tests/bench_exports.py --entries 10000 --compare bench_base.json
+
+Usa backend.settings_bench: SQLite en memoria por defecto, o un Postgres local
+dedicado si se define BENCH_DATABASE_NAME (sin SSL salvo que PGSSLMODE diga otra cosa):
+    BENCH_DATABASE_NAME=bench PGSSLMODE=disable python tests/bench_exports.py ...
+
+El script se niega a correr contra un host que no sea local, o contra una base que
+ya tenga FormularioEntry, salvo que se pase --allow-db: inserta muchas filas y
+zip_bytes_todos_los_forms mediría también los formularios reales.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid as uuid_lib
+from datetime import datetime, timedelta, timezone as dt_timezone
+from pathlib import Path
+
+CLASES = ("string", "number", "boolean", "dataset")
+FORMATOS = ("xlsx", "csv", "json")
+FUNCIONES = ("dataframe_por_form", "excel_bytes_para_un_form", "content_bytes_para_un_form", "zip_bytes_todos_los_forms")
+STATUS = ("Completado", "Pendiente", "Enviado")
+PALABRAS = ("caña", "lote", "finca", "zafra", "riego", "corte", "norte", "sur", "bloque", "parcela")
+DATASET = (
+    {"id": "GT", "label": "Guatemala"},
+    {"id": "MX", "label": "México"},
+    {"id": "HN", "label": "Honduras"},
+    {"id": "SV", "label": "El Salvador"},
+)
+BATCH_SIZE = 5000
+LOCAL_HOSTS = ("", "localhost", "127.0.0.1", "::1")
+
+
+def setup_django(allow_db=False):
+    # Permite ejecutar el script directamente desde la raíz del backend
+    root = Path(__file__).resolve().parent.parent
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings_bench")
+
+    import django
+    from django.core.management import call_command
+    from django.db import connection
+
+    django.setup()
+
+    host = connection.settings_dict.get("HOST") or ""
+    if connection.vendor != "sqlite" and host not in LOCAL_HOSTS and not allow_db:
+        raise SystemExit(f"La base de datos apunta a '{host}', que no es local. Usar --allow-db para forzar.")
+
+    # Revisar antes de migrar para no tocar el esquema de una base con datos
+    from formularios.models import FormularioEntry
+    existe = FormularioEntry._meta.db_table in connection.introspection.table_names()
+    if existe and FormularioEntry.objects.exists() and not allow_db:
+        raise SystemExit("La base de datos ya tiene FormularioEntry; usar una base vacía o --allow-db.")
+
+    # Con migraciones deshabilitadas para formularios: crear tablas igual que conftest.py
+    call_command("migrate", run_syncdb=True, verbosity=0)
+    if FormularioEntry._meta.db_table not in connection.introspection.table_names():
+        with connection.schema_editor() as schema:
+            schema.create_model(FormularioEntry)
+
+
+# =============== GENERADOR ===============
+
+def build_form_json(rng, paginas, campos_por_pagina, version):
+    """
+    Construye un form_json con la misma forma que el del backend.
+    Cada versión nueva agrega un campo al final de cada página, para que las
+    versiones compartan la mayoría de columnas pero no todas.
+    """
+    seq = 0
+    out = []
+    for p in range(paginas):
+        campos = []
+        for c in range(campos_por_pagina + version):
+            seq += 1
+            clase = CLASES[(p + c) % len(CLASES)]
+            campos.append({
+                "id_campo": f"c{p}_{c}",
+                "nombre_interno": f"p{p}_campo{c}",
+                "etiqueta": f"Página {p + 1} - Campo {c + 1}",
+                "clase": clase,
+                "tipo": clase,
+                "requerido": rng.random() < 0.3,
+                "sequence": seq,
+            })
+        out.append({"id_pagina": f"page{p}", "campos": campos})
+    return {"paginas": out}
+
+
+def build_fill_json(rng, form_json):
+    fill = {}
+    for pagina in form_json["paginas"]:
+        valores = {}
+        for campo in pagina["campos"]:
+            # ~10% de campos sin responder, como en datos reales
+            if rng.random() < 0.1:
+                continue
+            clase = campo["clase"]
+            if clase == "number":
+                valores[campo["nombre_interno"]] = str(rng.randint(0, 5000))
+            elif clase == "boolean":
+                valores[campo["nombre_interno"]] = rng.choice(("true", "false"))
+            elif clase == "dataset":
+                valores[campo["nombre_interno"]] = dict(rng.choice(DATASET))
+            else:
+                valores[campo["nombre_interno"]] = " ".join(rng.choices(PALABRAS, k=3))
+        fill[pagina["id_pagina"]] = valores
+    return fill
+
+
+def generate_entries(entries, forms=1, paginas=5, campos_por_pagina=8, versiones=3, usuarios=50, seed=2025):
+    """
+    Inserta `entries` FormularioEntry repartidos entre `forms` formularios y
+    devuelve la lista de form_id creados. Inserta con bulk_create por lotes.
+    """
+    from formularios.models import FormularioEntry
+
+    rng = random.Random(seed)
+    inicio = datetime(2025, 11, 1, 6, 0, tzinfo=dt_timezone.utc)
+    form_ids = []
+
+    for f in range(forms):
+        form_id = str(uuid_lib.uuid4())
+        form_ids.append(form_id)
+        versions = [
+            (str(uuid_lib.uuid4()), build_form_json(rng, paginas, campos_por_pagina, v))
+            for v in range(versiones)
+        ]
+        # El último formulario absorbe el resto de la división
+        n = entries // forms + (entries % forms if f == forms - 1 else 0)
+
+        batch = []
+        for i in range(n):
+            # Las entradas más recientes usan las versiones más nuevas
+            version_id, form_json = versions[min(i * versiones // max(n, 1), versiones - 1)]
+            filled = inicio + timedelta(minutes=i * 3 + rng.randint(0, 2))
+            batch.append(FormularioEntry(
+                id=str(uuid_lib.uuid4()),
+                id_usuario=f"user{rng.randrange(usuarios)}",
+                form_id=form_id,
+                index_version_id=version_id,
+                form_name=f"Formulario Benchmark {f + 1}",
+                filled_at_local=filled,
+                status=rng.choice(STATUS),
+                fill_json=build_fill_json(rng, form_json),
+                form_json=form_json,
+                created_at=filled,
+                updated_at=filled + timedelta(minutes=rng.randint(0, 30)),
+            ))
+            if len(batch) >= BATCH_SIZE:
+                FormularioEntry.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            FormularioEntry.objects.bulk_create(batch)
+
+    return form_ids
+
+
+def clear_entries(form_ids):
+    from formularios.models import FormularioEntry
+    FormularioEntry.objects.filter(form_id__in=form_ids).delete()
+
+
+# =============== MEDICIÓN ===============
+
+def measure(fn, repeat=1, trace_memory=True):
+    """
+    Ejecuta `fn` y devuelve tiempos, queries y memoria pico.
+    La memoria es el pico de tracemalloc (asignaciones de Python durante `fn`), medido
+    en una corrida aparte porque tracemalloc distorsiona el tiempo. No se reporta
+    ru_maxrss: es el máximo de todo el proceso y no distingue un caso de otro.
+    """
+    from django.db import connection, reset_queries
+    from django.test.utils import CaptureQueriesContext
+
+    tiempos = []
+    queries = 0
+    for _ in range(repeat):
+        gc.collect()
+        # queries_log está acotado a 9000 entradas: lleno, CaptureQueriesContext cuenta 0
+        reset_queries()
+        with CaptureQueriesContext(connection) as ctx:
+            t0 = time.perf_counter()
+            fn()
+            tiempos.append(time.perf_counter() - t0)
+        queries = len(ctx.captured_queries)
+
+    pico = None
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "wall_s_min": round(min(tiempos), 4),
+        "wall_s_median": round(statistics.median(tiempos), 4),
+        "queries": queries,
+        "peak_traced_bytes": pico,
+    }
+
+
+def benchmark_cases(form_id, formatos, funciones):
+    """Devuelve (funcion, formato, callable) para cada caso a medir."""
+    from formularios.exports import (
+        dataframe_por_form,
+        excel_bytes_para_un_form,
+        content_bytes_para_un_form,
+        zip_bytes_todos_los_forms,
+    )
+
+    casos = []
+    if "dataframe_por_form" in funciones:
+        casos.append(("dataframe_por_form", None, lambda: dataframe_por_form(form_id)))
+    if "excel_bytes_para_un_form" in funciones:
+        casos.append(("excel_bytes_para_un_form", "xlsx", lambda: excel_bytes_para_un_form(form_id)))
+    for fmt in formatos:
+        if "content_bytes_para_un_form" in funciones:
+            casos.append(("content_bytes_para_un_form", fmt, lambda fmt=fmt: content_bytes_para_un_form(form_id, fmt)))
+        if "zip_bytes_todos_los_forms" in funciones:
+            casos.append(("zip_bytes_todos_los_forms", fmt, lambda fmt=fmt: zip_bytes_todos_los_forms(fmt)))
+    return casos
+
+
+def run(sizes, formatos=FORMATOS, funciones=FUNCIONES, forms=1, paginas=5, campos_por_pagina=8,
+        versiones=3, repeat=1, trace_memory=True, seed=2025, log=print):
+    """
+    Genera datos para cada tamaño, mide cada caso y devuelve la lista de resultados.
+    Los casos por formulario miden el primer formulario; `rows` es lo que realmente procesó cada caso.
+    """
+    from django.db import connection
+    from formularios.models import FormularioEntry
+
+    if min(sizes) < forms:
+        raise ValueError(f"Cada tamaño debe ser >= forms ({forms}) para que ningún formulario quede vacío")
+
+    forma = {"forms": forms, "pages": paginas, "fields_per_page": campos_por_pagina, "versions": versiones}
+    resultados = []
+    for size in sizes:
+        t0 = time.perf_counter()
+        form_ids = generate_entries(size, forms=forms, paginas=paginas, campos_por_pagina=campos_por_pagina,
+                                    versiones=versiones, seed=seed)
+        log(f"[{size} entries] datos generados en {time.perf_counter() - t0:.1f}s")
+        try:
+            filas_form = FormularioEntry.objects.filter(form_id=form_ids[0]).count()
+            for funcion, fmt, fn in benchmark_cases(form_ids[0], formatos, funciones):
+                metricas = measure(fn, repeat=repeat, trace_memory=trace_memory)
+                resultados.append({
+                    "function": funcion,
+                    "format": fmt,
+                    "entries": size,
+                    "rows": size if funcion == "zip_bytes_todos_los_forms" else filas_form,
+                    **forma,
+                    "db_vendor": connection.vendor,
+                    **metricas,
+                })
+                log(f"  {funcion:<28} {fmt or '-':<5} {metricas['wall_s_median']:>9.3f}s "
+                    f"{(metricas['peak_traced_bytes'] or 0) / 2**20:>9.1f} MiB {metricas['queries']:>5} q")
+        finally:
+            clear_entries(form_ids)
+    return resultados
+
+
+def _key(r):
+    # Solo se comparan corridas con la misma forma de datos
+    return (
+        r["function"], r["format"], r["entries"], r["db_vendor"],
+        r.get("forms"), r.get("pages"), r.get("fields_per_page"), r.get("versions"),
+    )
+
+
+def compare(actual, base, threshold=0.2):
+    """
+    Compara contra un JSON previo y devuelve las regresiones que superan
+    `threshold` (fracción) en tiempo mediano, memoria pico o número de queries.
+    """
+    previos = {_key(r): r for r in base.get("results", [])}
+    regresiones = []
+    for r in actual:
+        prev = previos.get(_key(r))
+        if not prev:
+            continue
+        for metrica in ("wall_s_median", "peak_traced_bytes", "queries"):
+            antes, ahora = prev.get(metrica), r.get(metrica)
+            if not antes or ahora is None:
+                continue
+            cambio = (ahora - antes) / antes
+            if cambio > threshold:
+                regresiones.append({
+                    "function": r["function"],
+                    "format": r["format"],
+                    "entries": r["entries"],
+                    "metric": metrica,
+                    "before": antes,
+                    "after": ahora,
+                    "change": round(cambio, 3),
+                })
+    return regresiones
+
+
+def metadata():
+    import django
+    import pandas as pd
+    import openpyxl
+
+    return {
+        "timestamp": datetime.now(dt_timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "django": django.get_version(),
+        "pandas": pd.__version__,
+        "openpyxl": openpyxl.__version__,
+        "settings": os.environ.get("DJANGO_SETTINGS_MODULE"),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de exportaciones de FormularioEntry")
+    parser.add_argument("--entries", type=int, nargs="+", default=[10000],
+                        help="Tamaños a medir (ej. 10000 100000 1000000)")
+    parser.add_argument("--forms", type=int, default=1, help="Formularios entre los que se reparten las entradas")
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--fields-per-page", type=int, default=8)
+    parser.add_argument("--versions", type=int, default=3, help="index_version_id distintos por formulario")
+    parser.add_argument("--formats", nargs="+", choices=FORMATOS, default=list(FORMATOS))
+    parser.add_argument("--functions", nargs="+", choices=FUNCIONES, default=list(FUNCIONES))
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--no-memory", action="store_true", help="No medir memoria con tracemalloc")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--output", help="Archivo JSON de resultados (por defecto stdout)")
+    parser.add_argument("--compare", help="JSON de una corrida anterior para detectar regresiones")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Regresión tolerada (0.2 = 20%%)")
+    parser.add_argument("--allow-db", action="store_true",
+                        help="Permitir una base no local o con datos existentes")
+    args = parser.parse_args(argv)
+    if min(args.entries) < args.forms:
+        parser.error("--entries debe ser >= --forms; si no, algunos formularios quedan sin respuestas")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_django(allow_db=args.allow_db)
+
+    log = lambda msg: print(msg, file=sys.stderr)
+    resultados = run(
+        args.entries,
+        formatos=args.formats,
+        funciones=args.functions,
+        forms=args.forms,
+        paginas=args.pages,
+        campos_por_pagina=args.fields_per_page,
+        versiones=args.versions,
+        repeat=args.repeat,
+        trace_memory=not args.no_memory,
+        seed=args.seed,
+        log=log,
+    )
+    reporte = {"metadata": metadata(), "params": vars(args), "results": resultados}
+
+    regresiones = []
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            regresiones = compare(resultados, json.load(fh), args.threshold)
+        reporte["regressions"] = regresiones
+        for r in regresiones:
+            log(f"REGRESIÓN {r['function']} {r['format'] or '-'} {r['entries']}: "
+                f"{r['metric']} {r['before']} -> {r['after']} (+{r['change']:.0%})")
+
+    texto = json.dumps(reporte, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(texto)
+    else:
+        print(texto)
+
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+import pytest
+import random
+from bench_exports import (
+    build_form_json,
+    build_fill_json,
+    generate_entries,
+    clear_entries,
+    compare,
+    measure,
+    parse_args,
+    run,
+)
+from django.db import connection
+from formularios.models import FormularioEntry
+
+
+def test_build_form_json_versions_add_fields():
+    # Test que cada versión agrega un campo por página
+    rng = random.Random(1)
+    v0 = build_form_json(rng, paginas=2, campos_por_pagina=4, version=0)
+    v2 = build_form_json(rng, paginas=2, campos_por_pagina=4, version=2)
+
+    assert len(v0["paginas"]) == 2
+    assert len(v0["paginas"][0]["campos"]) == 4
+    assert len(v2["paginas"][0]["campos"]) == 6
+
+
+def test_build_fill_json_mixed_clases():
+    # Test que los valores respetan la clase del campo
+    rng = random.Random(1)
+    form_json = build_form_json(rng, paginas=3, campos_por_pagina=8, version=0)
+    fill = build_fill_json(rng, form_json)
+
+    clases = {
+        c["nombre_interno"]: c["clase"]
+        for p in form_json["paginas"] for c in p["campos"]
+    }
+    for pagina in fill.values():
+        for nombre, valor in pagina.items():
+            if clases[nombre] == "dataset":
+                assert "label" in valor
+            elif clases[nombre] == "boolean":
+                assert valor in ("true", "false")
+            elif clases[nombre] == "number":
+                assert valor.isdigit()
+
+
+@pytest.mark.django_db
+def test_generate_entries_counts_and_versions():
+    # Test que reparte las entradas entre formularios y versiones
+    form_ids = generate_entries(11, forms=2, paginas=2, campos_por_pagina=3, versiones=3)
+
+    assert len(form_ids) == 2
+    assert FormularioEntry.objects.filter(form_id__in=form_ids).count() == 11
+    versiones = set(
+        FormularioEntry.objects.filter(form_id=form_ids[1]).values_list("index_version_id", flat=True)
+    )
+    assert len(versiones) == 3
+
+    clear_entries(form_ids)
+    assert not FormularioEntry.objects.filter(form_id__in=form_ids).exists()
+
+
+@pytest.mark.django_db
+def test_run_small_reports_metrics():
+    # Test corrida mínima: una fila de resultados por función y formato
+    resultados = run(
+        [6],
+        formatos=["csv", "json"],
+        paginas=2,
+        campos_por_pagina=3,
+        versiones=2,
+        log=lambda msg: None,
+    )
+
+    casos = {(r["function"], r["format"]) for r in resultados}
+    assert ("dataframe_por_form", None) in casos
+    assert ("excel_bytes_para_un_form", "xlsx") in casos
+    assert ("content_bytes_para_un_form", "csv") in casos
+    assert ("zip_bytes_todos_los_forms", "json") in casos
+    for r in resultados:
+        assert r["entries"] == 6
+        assert r["rows"] == 6
+        assert r["pages"] == 2
+        assert r["wall_s_median"] >= 0
+        assert r["queries"] >= 1
+        assert r["peak_traced_bytes"] > 0
+
+    # Los datos generados se limpian al terminar
+    assert not FormularioEntry.objects.exists()
+
+
+@pytest.mark.django_db
+def test_run_multiple_forms_reports_measured_rows():
+    # Test que con varios formularios cada caso reporta las filas que realmente procesó
+    resultados = run(
+        [7],
+        formatos=["csv"],
+        funciones=["dataframe_por_form", "zip_bytes_todos_los_forms"],
+        forms=2,
+        paginas=1,
+        campos_por_pagina=2,
+        versiones=1,
+        trace_memory=False,
+        log=lambda msg: None,
+    )
+
+    filas = {r["function"]: r["rows"] for r in resultados}
+    assert filas["dataframe_por_form"] == 3
+    assert filas["zip_bytes_todos_los_forms"] == 7
+    assert all(r["forms"] == 2 for r in resultados)
+
+
+@pytest.mark.django_db
+def test_measure_counts_queries_with_full_queries_log():
+    # Test que el conteo no queda en 0 cuando queries_log ya llegó a su límite
+    for _ in range(connection.queries_log.maxlen + 500):
+        connection.queries_log.append({"sql": "SELECT 1", "time": "0.000"})
+
+    metricas = measure(lambda: FormularioEntry.objects.count(), trace_memory=False)
+
+    assert metricas["queries"] >= 1
+
+
+def test_run_rejects_sizes_smaller_than_forms():
+    # Test que no se generan formularios vacíos
+    with pytest.raises(ValueError):
+        run([1], forms=2, log=lambda msg: None)
+
+
+def test_parse_args_rejects_entries_smaller_than_forms():
+    # Test que la CLI valida los tamaños antes de tocar la base
+    with pytest.raises(SystemExit):
+        parse_args(["--entries", "10", "1", "--forms", "2"])
+
+
+def test_compare_ignores_different_data_shape():
+    # Test que no compara corridas con distinta forma de datos
+    base = {"results": [{
+        "function": "dataframe_por_form", "format": None, "entries": 10, "db_vendor": "sqlite",
+        "forms": 1, "pages": 5, "fields_per_page": 8, "versions": 3,
+        "wall_s_median": 1.0, "peak_traced_bytes": 1000, "queries": 1,
+    }]}
+    actual = [dict(base["results"][0], pages=20, wall_s_median=5.0)]
+
+    assert compare(actual, base) == []
+
+
+def test_compare_detects_regression():
+    # Test que compara contra una corrida anterior con umbral
+    base = {"results": [{
+        "function": "dataframe_por_form", "format": None, "entries": 10, "db_vendor": "sqlite",
+        "wall_s_median": 1.0, "peak_traced_bytes": 1000, "queries": 1,
+    }]}
+    actual = [{
+        "function": "dataframe_por_form", "format": None, "entries": 10, "db_vendor": "sqlite",
+        "wall_s_median": 1.1, "peak_traced_bytes": 2000, "queries": 1,
+    }]
+
+    regresiones = compare(actual, base, threshold=0.2)
+
+    assert len(regresiones) == 1
+    assert regresiones[0]["metric"] == "peak_traced_bytes"
+    assert regresiones[0]["change"] == 1.0